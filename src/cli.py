@@ -8,6 +8,31 @@ from query import exact_search, fuzzy_search
 from utils.config import DB_FILE, ensure_dirs
 
 
+def run_search(db: OCRDatabase, term_to_search: str):
+    """Ask for the search mode, run one search and print its matches."""
+    search_mode = input("Search mode (1=exact, 2=fuzzy): ").strip()
+
+    if search_mode == "2":
+        threshold_input = input(
+            "Enter fuzzy threshold (0.0-1.0, default 0.5): "
+        ).strip()
+        threshold = float(threshold_input) if threshold_input else 0.5
+        matches = fuzzy_search(db, term_to_search, threshold=threshold)
+        print(f"\nPerforming fuzzy search (threshold: {threshold})...")
+    else:
+        matches = exact_search(db, term_to_search)
+        print("\nPerforming exact search...")
+
+    if matches:
+        print(f"\nFound {len(matches)} matches:")
+        print("=" * 60)
+        for filename, _text in matches:
+            # print_result(filename, _text)
+            print(f"  {filename}")
+    else:
+        print("\nNo matches found.")
+
+
 def main():
     """Main query function."""
     # Ensure all required directories exist
@@ -16,32 +41,18 @@ def main():
     print("OCR Query Tool")
     print("=" * 60)
 
-    term_to_search = input("Enter text to search: ")
-    search_mode = input("Search mode (1=exact, 2=fuzzy): ").strip()
-
-    # Initialize database handler
+    # Initialize database handler, kept open to serve every search in the session
     db = OCRDatabase(DB_FILE)
 
     try:
-        if search_mode == "2":
-            threshold_input = input(
-                "Enter fuzzy threshold (0.0-1.0, default 0.5): "
-            ).strip()
-            threshold = float(threshold_input) if threshold_input else 0.5
-            matches = fuzzy_search(db, term_to_search, threshold=threshold)
-            print(f"\nPerforming fuzzy search (threshold: {threshold})...")
-        else:
-            matches = exact_search(db, term_to_search)
-            print("\nPerforming exact search...")
-
-        if matches:
-            print(f"\nFound {len(matches)} matches:")
-            print("=" * 60)
-            for filename, _text in matches:
-                # print_result(filename, _text)
-                print(f"  {filename}")
-        else:
-            print("\nNo matches found.")
+        while True:
+            try:
+                term_to_search = input("\nEnter text to search (empty to quit): ")
+            except EOFError:
+                break
+            if not term_to_search:
+                break
+            run_search(db, term_to_search)
 
     finally:
         # Cleanup
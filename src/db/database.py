@@ -1,55 +1,293 @@
+import queue
+from collections import OrderedDict
 import sqlite3
 import threading
-from typing import Tuple, List
+import unicodedata
+from contextlib import contextmanager
+from typing import FrozenSet, Iterator, Optional, Tuple, List
+
+# Applied once to every new connection. WAL lets readers proceed alongside a
+# writer and, with synchronous=NORMAL, avoids an fsync on every commit.
+# Reads go through a memory map of up to 1 GiB instead of read() calls.
+_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 1073741824;
+"""
+
+# Keeps the ocr_fts full-text index in sync with the ocr_data content table.
+_FTS_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS ocr_data_ai AFTER INSERT ON ocr_data BEGIN
+        INSERT INTO ocr_fts (rowid, filename, ocr_text)
+        VALUES (new.id, new.filename, new.ocr_text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS ocr_data_ad AFTER DELETE ON ocr_data BEGIN
+        INSERT INTO ocr_fts (ocr_fts, rowid, filename, ocr_text)
+        VALUES ('delete', old.id, old.filename, old.ocr_text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS ocr_data_au AFTER UPDATE ON ocr_data BEGIN
+        INSERT INTO ocr_fts (ocr_fts, rowid, filename, ocr_text)
+        VALUES ('delete', old.id, old.filename, old.ocr_text);
+        INSERT INTO ocr_fts (rowid, filename, ocr_text)
+        VALUES (new.id, new.filename, new.ocr_text);
+    END;
+"""
+
+# Schema migrations applied on top of the base ocr_data table, in order.
+# PRAGMA user_version stores how many of them have already been applied.
+_MIGRATIONS = (
+    # 1: FTS5 index over ocr_text, using ocr_data as external content
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ocr_fts USING fts5(
+        filename UNINDEXED,
+        ocr_text,
+        content='ocr_data',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    """
+    + _FTS_TRIGGERS
+    + """
+    INSERT INTO ocr_fts (ocr_fts) VALUES ('rebuild');
+    """,
+    # 2: drop AUTOINCREMENT and make filename a NOT NULL natural key.
+    # ocr_fts needs an integer rowid, so the table can't go WITHOUT ROWID.
+    """
+    CREATE TABLE ocr_data_new (
+        id INTEGER PRIMARY KEY,
+        filename TEXT NOT NULL UNIQUE,
+        ocr_text TEXT
+    );
+    INSERT INTO ocr_data_new (id, filename, ocr_text)
+    SELECT id, filename, ocr_text FROM ocr_data WHERE filename IS NOT NULL;
+    DROP TABLE ocr_data;
+    ALTER TABLE ocr_data_new RENAME TO ocr_data;
+    """
+    + _FTS_TRIGGERS
+    + """
+    INSERT INTO ocr_fts (ocr_fts) VALUES ('rebuild');
+    """,
+    # 3: content hash of the image, to reuse OCR text for duplicate images
+    """
+    ALTER TABLE ocr_data ADD COLUMN content_hash TEXT;
+    CREATE INDEX IF NOT EXISTS idx_ocr_data_content_hash ON ocr_data (content_hash);
+    """,
+    # 4: case-folded text without diacritics, for fuzzy matching
+    """
+    ALTER TABLE ocr_data ADD COLUMN ocr_text_norm TEXT;
+    UPDATE ocr_data SET ocr_text_norm = normalize_text(ocr_text)
+    WHERE ocr_text IS NOT NULL;
+    """,
+)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for case- and diacritic-insensitive matching.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Case-folded, compatibility-decomposed text without combining marks
+    """
+    decomposed = unicodedata.normalize("NFKD", text).casefold()
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _fts_phrase(search_term: str) -> str:
+    """
+    Build an FTS5 query matching `search_term` as a phrase.
+
+    The last token is matched as a prefix, so partially typed words still match.
+
+    Args:
+        search_term: Text to search for
+
+    Returns:
+        FTS5 query string
+    """
+    return '"' + search_term.replace('"', '""') + '" *'
+
+
+def _split_statements(script: str) -> List[str]:
+    """
+    Split an SQL script into single statements, keeping trigger bodies whole.
+
+    Args:
+        script: SQL statements separated by semicolons
+
+    Returns:
+        List of statements
+    """
+    statements = []
+    pending = ""
+    for part in script.split(";"):
+        pending += part + ";"
+        if sqlite3.complete_statement(pending):
+            if pending.strip(" \n;"):
+                statements.append(pending.strip())
+            pending = ""
+    return statements
 
 
 class OCRDatabase:
     """
     Thread-safe SQLite database handler for OCR data.
-    Uses thread-local storage to ensure each thread has its own connection.
+    Shares a pool of read connections and a single write connection
+    between all threads.
     """
 
-    def __init__(self, db_file: str):
+    # Prepared once per connection and reused from its statement cache
+    _INSERT_SQL = (
+        "INSERT OR IGNORE INTO ocr_data"
+        " (filename, ocr_text, ocr_text_norm, content_hash) VALUES (?, ?, ?, ?)"
+    )
+
+    def __init__(self, db_file: str, pool_size: int = 4):
         """
         Initialize the database handler.
 
         Args:
             db_file: Path to the SQLite database file
+            pool_size: Number of pooled read connections, at least 1
         """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
         self.db_file = db_file
-        self._local = threading.local()
-        self._lock = threading.Lock()
+        self._closed = False
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
+        # Number of transactions committed through write()
+        self._writes = 0
+        # Recent search results and their sizes, least recently used first,
+        # kept by query.py
+        self.query_cache: OrderedDict = OrderedDict()
+        # Create the schema before any reader connects
         self._initialize_schema()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._read_pool.put(self._connect())
 
-    def _get_connection(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
+    def _connect(self) -> sqlite3.Connection:
         """
-        Get or create a thread-local database connection.
+        Open a new connection that can be shared across threads.
 
         Returns:
-            Tuple of (connection, cursor)
+            Connection with the PRAGMAs applied
+        """
+        conn = sqlite3.connect(
+            self.db_file, check_same_thread=False, cached_statements=256
+        )
+        conn.executescript(_PRAGMAS)
+        conn.create_function("normalize_text", 1, normalize_text, deterministic=True)
+        return conn
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Check out a read connection from the pool, waiting for a free one.
+
+        Yields:
+            Cursor on the read connection
+
+        Raises:
+            sqlite3.ProgrammingError: If the database has been closed
+        """
+        # The pool is empty once closed, waiting on it would block forever
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        conn = self._read_pool.get()
+        try:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+        finally:
+            # Connections checked out while closing are closed on return
+            if self._closed:
+                conn.close()
+            else:
+                self._read_pool.put(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Cursor]:
         """
-        if not hasattr(self._local, "conn") or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_file, check_same_thread=False)
-            self._local.cursor = self._local.conn.cursor()
-        return self._local.conn, self._local.cursor
+        Use the write connection exclusively, within a single transaction.
+        Commits on success and rolls back if an exception is raised.
+
+        Yields:
+            Cursor on the write connection
+        """
+        with self._write_lock:
+            cursor = self._write_conn.cursor()
+            try:
+                yield cursor
+                self._write_conn.commit()
+                self._writes += 1
+            except BaseException:
+                self._write_conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def data_version(self) -> Tuple[int, int]:
+        """
+        Get a token that changes whenever the stored data may have changed,
+        either through this handler or through any other connection.
+
+        Returns:
+            Opaque version tuple, comparable for equality
+        """
+        with self._write_lock:
+            # Only changes on commits made by other connections
+            (version,) = self._write_conn.execute("PRAGMA data_version").fetchone()
+            return version, self._writes
 
     def _initialize_schema(self):
         """Create the database schema if it doesn't exist."""
-        conn, cursor = self._get_connection()
-        cursor.execute(
+        # Base schema, brought up to date by _migrate()
+        with self.write() as cursor:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ocr_data (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    filename TEXT UNIQUE,
+                    ocr_text TEXT
+                )
             """
-            CREATE TABLE IF NOT EXISTS ocr_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                filename TEXT UNIQUE,
-                ocr_text TEXT
             )
+        self._migrate(self._write_conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
         """
-        )
-        conn.commit()
+        Apply pending schema migrations, each one in its own transaction.
+        The version is read again once the write lock is held, so processes
+        opening the database at the same time never apply a migration twice.
+        """
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+                if version >= len(_MIGRATIONS):
+                    conn.rollback()
+                    return
+                # Statement by statement, executescript() would commit first
+                for statement in _split_statements(_MIGRATIONS[version]):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
     def file_exists(self, filename: str) -> bool:
         """
         Check if a file already exists in the database.
+        Kept as public API, processing checks get_all_filenames() instead.
 
         Args:
             filename: The filename to check
@@ -57,84 +295,207 @@ class OCRDatabase:
         Returns:
             True if the file exists, False otherwise
         """
-        _, cursor = self._get_connection()
-        cursor.execute("SELECT 1 FROM ocr_data WHERE filename = ?", (filename,))
-        return cursor.fetchone() is not None
+        with self.read() as cursor:
+            # Answered from the UNIQUE index on filename alone
+            cursor.execute(
+                "SELECT 1 FROM ocr_data WHERE filename = ? LIMIT 1", (filename,)
+            )
+            return cursor.fetchone() is not None
+
+    def get_all_filenames(self) -> FrozenSet[str]:
+        """
+        Get the names of all files already in the database, in one query.
+
+        Returns:
+            Set of filenames
+        """
+        with self.read() as cursor:
+            cursor.execute("SELECT filename FROM ocr_data")
+            return frozenset(filename for (filename,) in cursor)
+
+    def get_all_hashes(self) -> FrozenSet[str]:
+        """
+        Get the content hashes of all images already in the database.
+
+        Returns:
+            Set of content hashes
+        """
+        with self.read() as cursor:
+            cursor.execute(
+                "SELECT content_hash FROM ocr_data WHERE content_hash IS NOT NULL"
+            )
+            return frozenset(content_hash for (content_hash,) in cursor)
 
-    def save_ocr_data(self, filename: str, text: str) -> bool:
+    def get_text_by_hash(self, content_hash: str) -> Optional[str]:
+        """
+        Get the OCR text already stored for an image with the same content.
+
+        Args:
+            content_hash: Hash of the image file contents
+
+        Returns:
+            The OCR text, or None if no such image is in the database
+        """
+        with self.read() as cursor:
+            cursor.execute(
+                "SELECT ocr_text FROM ocr_data WHERE content_hash = ? LIMIT 1",
+                (content_hash,),
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def save_ocr_data(
+        self, filename: str, text: str, content_hash: Optional[str] = None
+    ) -> bool:
         """
         Save OCR text to the database.
 
         Args:
             filename: The name of the file
             text: The OCR extracted text
+            content_hash: Hash of the image file contents
 
         Returns:
             True if saved successfully, False if already exists
         """
-        if self.file_exists(filename):
-            return False
+        # The UNIQUE filename index does the existence check
+        with self.write() as cursor:
+            cursor.execute(
+                self._INSERT_SQL,
+                (filename, text, normalize_text(text), content_hash),
+            )
+            return cursor.rowcount == 1
 
-        conn, cursor = self._get_connection()
-        with self._lock:
-            try:
-                cursor.execute(
-                    "INSERT INTO ocr_data (filename, ocr_text) VALUES (?, ?)",
-                    (filename, text),
-                )
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # Another thread inserted it first
-                return False
+    def save_ocr_batch(self, rows: List[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Save many OCR results in a single transaction.
+        Files already in the database are left untouched.
+
+        Args:
+            rows: List of (filename, ocr_text, content_hash) tuples
+
+        Returns:
+            Number of rows actually inserted
+        """
+        with self.write() as cursor:
+            cursor.executemany(
+                self._INSERT_SQL,
+                (
+                    (filename, text, normalize_text(text), content_hash)
+                    for filename, text, content_hash in rows
+                ),
+            )
+            return cursor.rowcount
 
-    def search_exact(self, search_term: str) -> List[Tuple[str, str]]:
+    def search_exact(
+        self, search_term: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Tuple[str, str]]:
         """
         Perform an exact search for text in OCR data.
+        Uses the FTS5 index, matching case- and diacritic-insensitively.
 
         Args:
             search_term: Text to search for
+            limit: Maximum number of results, None for all of them
+            offset: Number of best matches to skip, for paging
 
         Returns:
-            List of (filename, ocr_text) tuples
+            List of (filename, snippet) tuples, best matches first by BM25,
+            where snippet is the part of the OCR text around the match
         """
-        _, cursor = self._get_connection()
-        cursor.execute(
-            "SELECT filename, ocr_text FROM ocr_data WHERE ocr_text LIKE ?",
-            (f"%{search_term}%",),
-        )
-        return cursor.fetchall()
+        with self.read() as cursor:
+            cursor.execute(
+                """
+                SELECT filename, snippet(ocr_fts, 1, '[', ']', '…', 10)
+                FROM ocr_fts WHERE ocr_fts MATCH ?
+                ORDER BY bm25(ocr_fts) LIMIT ? OFFSET ?
+                """,
+                (_fts_phrase(search_term), -1 if limit is None else limit, offset),
+            )
+            return cursor.fetchall()
+
+    def count_exact(self, search_term: str) -> int:
+        """
+        Count the matches of an exact search.
+
+        Args:
+            search_term: Text to search for
+
+        Returns:
+            Number of files matching the search term
+        """
+        with self.read() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM ocr_fts WHERE ocr_fts MATCH ?",
+                (_fts_phrase(search_term),),
+            )
+            return cursor.fetchone()[0]
 
-    def get_all_records(self) -> List[Tuple[int, str, str]]:
+    def get_all_records(self) -> List[Tuple[str, str]]:
         """
         Get all records from the database.
+        Kept as public API, searches stream records with iter_records() instead.
 
         Returns:
-            List of (id, filename, ocr_text) tuples
+            List of (filename, ocr_text) tuples
+        """
+        with self.read() as cursor:
+            cursor.execute("SELECT filename, ocr_text FROM ocr_data")
+            return cursor.fetchall()
+
+    def iter_records(self, min_length: float = 0) -> Iterator[Tuple[str, str, str]]:
+        """
+        Iterate over all records without loading the whole table in memory.
+        A pooled read connection is held until the iteration ends.
+
+        Args:
+            min_length: Only yield records whose normalized text has at least
+                this many characters, filtered within SQLite
+
+        Yields:
+            (filename, ocr_text, ocr_text_norm) tuples
         """
-        _, cursor = self._get_connection()
-        cursor.execute("SELECT id, filename, ocr_text FROM ocr_data")
-        return cursor.fetchall()
+        query = "SELECT filename, ocr_text, ocr_text_norm FROM ocr_data"
+        params = ()
+        if min_length > 0:
+            query += " WHERE length(ocr_text_norm) >= ?"
+            params = (min_length,)
+
+        with self.read() as cursor:
+            cursor.execute(query, params)
+            yield from cursor
+
+    def optimize(self):
+        """
+        Refresh the query planner statistics after a run of inserts.
+        The full-text indexes are left to FTS5 automerge, merging them in full
+        would rewrite them entirely on every run.
+        """
+        with self.write() as cursor:
+            cursor.execute("PRAGMA optimize")
 
     def close(self):
-        """Close the thread-local database connection."""
-        if hasattr(self._local, "conn") and self._local.conn is not None:
-            self._local.conn.close()
-            self._local.conn = None
-            self._local.cursor = None
+        """Close all database connections."""
+        self.close_all()
 
     def close_all(self):
         """
-        Close all connections. Use this when completely shutting down.
-        Note: This only closes the current thread's connection.
-        For full cleanup, call close() from each thread.
+        Close the write connection and every read connection in the pool.
+        Use this when completely shutting down.
         """
-        self.close()
+        self._closed = True
+        self.query_cache.clear()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._write_conn.close()
 
     def __enter__(self):
         """Context manager entry."""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close connection."""
+        """Context manager exit - close connections."""
         self.close()
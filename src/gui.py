@@ -11,7 +11,7 @@ import platform
 import threading
 
 from db.database import OCRDatabase
-from query import exact_search, fuzzy_search
+from query import count_exact_matches, exact_search, fuzzy_search
 from process import process
 from utils.ocr_processor import ProcessingStatus
 from utils.config import (
@@ -23,6 +23,12 @@ from utils.config import (
     get_max_workers,
 )
 
+# Delay before searching while the user is typing, in milliseconds
+SEARCH_DEBOUNCE_MS = 150
+
+# Number of results rendered at a time, more are loaded when scrolling to the end
+RESULTS_PAGE_SIZE = 50
+
 
 class OCRQueryGUI:
     """GUI application for OCR database queries."""
@@ -40,7 +46,7 @@ class OCRQueryGUI:
         self.screenshots_dir = get_screenshots_dir()
 
         # Database instance
-        self.db = OCRDatabase(DB_FILE)
+        self.db = OCRDatabase(DB_FILE, pool_size=get_max_workers())
 
         # Search mode (1=exact, 2=fuzzy)
         self.search_mode = tk.IntVar(value=1)
@@ -48,6 +54,20 @@ class OCRQueryGUI:
         # Fuzzy search threshold
         self.fuzzy_threshold = get_fuzzy_threshold()
 
+        # Pending search-as-you-type callback and the last term searched
+        self._search_after_id = None
+        self._last_search_term = ""
+
+        # Full path of the file linked on each line of the results
+        self._link_paths = {}
+
+        # Paging of the current results: fetch_page(offset, limit), number of
+        # results rendered so far and in total
+        self._fetch_page = None
+        self._results_shown = 0
+        self._results_total = 0
+        self._load_more_id = None
+
         # Setup UI
         self._create_widgets()
 
@@ -145,11 +165,11 @@ class OCRQueryGUI:
         self.results_text = tk.Text(results_frame, wrap=tk.WORD, cursor="arrow")
         self.results_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-        scrollbar = ttk.Scrollbar(
+        self.results_scrollbar = ttk.Scrollbar(
             results_frame, orient=tk.VERTICAL, command=self.results_text.yview
         )
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.results_text.config(yscrollcommand=scrollbar.set)
+        self.results_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.results_text.config(yscrollcommand=self._on_results_scroll)
 
         # Configure text tags for clickable links
         self.results_text.tag_config("link", foreground="blue", underline=1)
@@ -168,7 +188,7 @@ class OCRQueryGUI:
         self.status_label.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
 
     def _on_entry_change(self, event=None):
-        """Show/hide clear button based on entry content."""
+        """Show/hide clear button based on entry content and schedule a search."""
         if self.search_entry.get():
             self.clear_button.place(
                 in_=self.search_entry, relx=1.0, rely=0.5, anchor=tk.E, x=-3
@@ -177,6 +197,25 @@ class OCRQueryGUI:
         else:
             self.clear_button.place_forget()
 
+        # Debounce: search only once typing pauses
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._auto_search)
+
+    def _auto_search(self):
+        """
+        Search for the entry content, if it changed since the last search.
+        Only exact searches run as you type, a fuzzy one scans the whole table
+        and would freeze the UI. Nothing runs during an update, as searching
+        would clear its log.
+        """
+        self._search_after_id = None
+        if self.search_mode.get() != 1 or self.search_button.instate(["disabled"]):
+            return
+        search_term = self.search_entry.get().strip()
+        if search_term and search_term != self._last_search_term:
+            self.perform_search()
+
     def _clear_search(self):
         """Clear the search entry field."""
         self.search_entry.delete(0, tk.END)
@@ -191,9 +230,13 @@ class OCRQueryGUI:
             messagebox.showinfo("Input Required", "Please enter a search term.")
             return
 
+        self._last_search_term = search_term
+
         # Clear previous results
         self.results_text.config(state=tk.NORMAL)
         self.results_text.delete(1.0, tk.END)
+        self._link_paths = {}
+        self._fetch_page = None
 
         # Update status
         mode_name = "exact" if self.search_mode.get() == 1 else "fuzzy"
@@ -201,51 +244,33 @@ class OCRQueryGUI:
         self.root.update()
 
         try:
-            # Perform search
+            # Perform search, results are then fetched a page at a time
             if self.search_mode.get() == 2:
                 matches = fuzzy_search(
                     self.db, search_term, threshold=self.fuzzy_threshold
                 )
+                total = len(matches)
+
+                def fetch_page(offset, limit):
+                    return matches[offset : offset + limit]
+
             else:
-                matches = exact_search(self.db, search_term)
+                total = count_exact_matches(self.db, search_term)
 
-            # Display results
-            if matches:
-                self.results_text.insert(tk.END, f"Found {len(matches)} match(es):\n\n")
-
-                for filename, _ in matches:
-                    # Create clickable filename
-                    full_path = os.path.join(self.screenshots_dir, filename)
-
-                    # Insert bullet and filename
-                    self.results_text.insert(tk.END, "• ")
-                    link_start = self.results_text.index(tk.INSERT)
-                    self.results_text.insert(tk.END, f"{filename}\n")
-                    link_end = self.results_text.index(f"{link_start} lineend")
-
-                    # Store the full path as a tag (only on filename, not bullet)
-                    tag_name = f"link_{filename}"
-                    self.results_text.tag_add(tag_name, link_start, link_end)
-                    self.results_text.tag_config(
-                        tag_name, foreground="blue", underline=1
-                    )
-                    self.results_text.tag_bind(
-                        tag_name,
-                        "<Button-1>",
-                        lambda e, path=full_path: self._open_file(path),
-                    )
-                    self.results_text.tag_bind(
-                        tag_name,
-                        "<Enter>",
-                        lambda e: self.results_text.config(cursor="hand2"),
-                    )
-                    self.results_text.tag_bind(
-                        tag_name,
-                        "<Leave>",
-                        lambda e: self.results_text.config(cursor="arrow"),
+                def fetch_page(offset, limit):
+                    return exact_search(
+                        self.db, search_term, limit=limit, offset=offset
                     )
 
-                self.status_label.config(text=f"Found {len(matches)} match(es)")
+            # Display results
+            if total:
+                self.results_text.insert(tk.END, f"Found {total} match(es):\n\n")
+                self._fetch_page = fetch_page
+                self._results_shown = 0
+                self._results_total = total
+                self._load_more_results()
+
+                self.status_label.config(text=f"Found {total} match(es)")
             else:
                 self.results_text.insert(tk.END, "No matches found.")
                 self.status_label.config(text="No matches found")
@@ -257,9 +282,50 @@ class OCRQueryGUI:
         finally:
             self.results_text.config(state=tk.DISABLED)
 
+    def _load_more_results(self):
+        """Render the next page of search results."""
+        self._load_more_id = None
+        if self._fetch_page is None or self._results_shown >= self._results_total:
+            return
+
+        page = self._fetch_page(self._results_shown, RESULTS_PAGE_SIZE)
+        if not page:
+            # Results changed since counting them
+            self._results_total = self._results_shown
+            return
+
+        # (chars, tags) pairs, results start after the two header lines
+        chunks = []
+        first_line = 3 + self._results_shown
+        for line, (filename, _) in enumerate(page, start=first_line):
+            # All filenames share the "link" tag, clicks are resolved by line
+            self._link_paths[line] = os.path.join(self.screenshots_dir, filename)
+            chunks += ["• ", (), filename, "link", "\n", ()]
+        self._results_shown += len(page)
+
+        # One call into Tk for the whole page
+        state = self.results_text.cget("state")
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.insert(tk.END, *chunks)
+        self.results_text.config(state=state)
+
+    def _on_results_scroll(self, first, last):
+        """Update the scrollbar and load more results once the end is visible."""
+        self.results_scrollbar.set(first, last)
+        if (
+            float(last) >= 1.0
+            and self._fetch_page is not None
+            and self._results_shown < self._results_total
+            and self._load_more_id is None
+        ):
+            self._load_more_id = self.root.after_idle(self._load_more_results)
+
     def _on_link_click(self, event):
-        """Handle click on a link (deprecated - using individual tag bindings instead)."""
-        pass
+        """Open the file linked on the clicked line."""
+        index = self.results_text.index(f"@{event.x},{event.y}")
+        path = self._link_paths.get(int(index.split(".")[0]))
+        if path:
+            self._open_file(path)
 
     def _open_file(self, filepath):
         """Open a file using the system's default application."""
@@ -295,6 +361,7 @@ class OCRQueryGUI:
         self.search_button.config(state=tk.DISABLED)
 
         # Clear results area and show starting message
+        self._fetch_page = None
         self.results_text.config(state=tk.NORMAL)
         self.results_text.delete(1.0, tk.END)
         self.results_text.insert(tk.END, "Starting OCR processing...\n\n")
@@ -314,7 +381,7 @@ class OCRQueryGUI:
         try:
             # Display initial info
             self._append_to_results(f"Processing from: {screenshots_dir}\n")
-            self._append_to_results(f"Using {max_workers} threads\n\n")
+            self._append_to_results(f"Using {max_workers} worker processes\n\n")
 
             # Define progress callback that updates GUI
             def gui_progress_callback(filename: str, status: ProcessingStatus):
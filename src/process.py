@@ -1,6 +1,6 @@
 """
 OCR Screenshot Processor
-Processes images from a folder using multithreaded OCR and stores results in SQLite database.
+Processes images from a folder using parallel OCR and stores results in SQLite database.
 """
 
 from db.database import OCRDatabase
@@ -42,7 +42,7 @@ def process(prog_callback=None):
     ensure_dirs()
 
     # Initialize database handler
-    db = OCRDatabase(DB_FILE)
+    db = OCRDatabase(DB_FILE, pool_size=MAX_WORKERS)
 
     # Initialize OCR processor
     processor = OCRProcessor(tesseract_path=TESSERACT_PATH, max_workers=MAX_WORKERS)
@@ -55,6 +55,10 @@ def process(prog_callback=None):
         folder_path=SCREENSHOTS_DIR, db_handler=db, progress_callback=callback
     )
 
+    # Refresh query planner statistics once new rows were written
+    if stats["processed"]:
+        db.optimize()
+
     # Cleanup
     db.close()
 
@@ -65,7 +69,7 @@ def main():
     """Main processing function."""
 
     print(f"Starting OCR processing from: {SCREENSHOTS_DIR}")
-    print(f"Using {MAX_WORKERS} threads\n")
+    print(f"Using {MAX_WORKERS} worker processes\n")
 
     # Process screenshots folder
     stats = process()
@@ -3,27 +3,69 @@ OCR Query Tool
 Search OCR database using fuzzy text matching.
 """
 
-import Levenshtein
+import heapq
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, Optional
 
-from db.database import OCRDatabase
+import numpy as np
+from rapidfuzz import fuzz, process
 
+from db.database import OCRDatabase, normalize_text
 
-def exact_search(db: OCRDatabase, search_term: str):
+# Number of records scored per RapidFuzz call while streaming the table
+SCORE_BATCH_SIZE = 1024
+
+# Number of recent search results kept in memory per database handler
+QUERY_CACHE_SIZE = 128
+
+# Total characters of filenames and texts those results may hold
+QUERY_CACHE_MAX_CHARS = 8 * 1024 * 1024
+
+
+def exact_search(
+    db: OCRDatabase, search_term: str, limit: Optional[int] = None, offset: int = 0
+):
     """
     Perform an exact search for `search_term` in the 'ocr_text' field.
 
     Args:
         db: OCRDatabase instance
         search_term: Text to search for
+        limit: Maximum number of results to return, None for all of them
+        offset: Number of best matches to skip, for paging
     Returns:
-        List of (filename, ocr_text) tuples matching the search term exactly
+        List of (filename, snippet) tuples matching the search term exactly,
+        sorted by relevance
     """
-    results = db.search_exact(search_term)
-    results.sort(key=lambda x: x[0])
-    return results
+    return list(
+        _cached(
+            db,
+            ("exact", search_term, limit, offset),
+            lambda: db.search_exact(search_term, limit=limit, offset=offset),
+        )
+    )
 
 
-def fuzzy_search(db: OCRDatabase, search_term: str, threshold: float = 0.6):
+def count_exact_matches(db: OCRDatabase, search_term: str) -> int:
+    """
+    Count the results `exact_search` finds for `search_term`.
+
+    Args:
+        db: OCRDatabase instance
+        search_term: Text to search for
+    Returns:
+        Number of matching files
+    """
+    return db.count_exact(search_term)
+
+
+def fuzzy_search(
+    db: OCRDatabase,
+    search_term: str,
+    threshold: float = 0.6,
+    limit: Optional[int] = None,
+):
     """
     Perform a fuzzy search for `search_term` in the 'ocr_text' field.
 
@@ -31,42 +73,131 @@ def fuzzy_search(db: OCRDatabase, search_term: str, threshold: float = 0.6):
         db: OCRDatabase instance
         search_term: Text to search for
         threshold: Approximate match threshold (0-1), closer to 1 is stricter
+        limit: Maximum number of results to return, None for all of them
+
+    Returns:
+        List of (filename, ocr_text) tuples matching the search term approximately,
+        best matches first
+    """
+    return list(
+        _cached(
+            db,
+            ("fuzzy", search_term, threshold, limit),
+            lambda: _rank_fuzzy(db, search_term, threshold, limit),
+        )
+    )
+
+
+def _cached(db: OCRDatabase, key: tuple, compute: Callable[[], Iterable]) -> tuple:
+    """
+    Look up search results in the handler's cache, computing them on a miss.
+    Keyed on the data version too, so writes invalidate it. The cache is
+    bounded by both number of results and their total size.
+
+    Args:
+        db: OCRDatabase instance
+        key: Search kind and arguments
+        compute: Function running the search
 
     Returns:
-        List of (filename, ocr_text) tuples matching the search term approximately
+        Tuple of results
     """
-    # Get all records and perform fuzzy matching in Python
-    all_records = db.get_all_records()
+    version = db.data_version()
+    key = (version,) + key
+    cache = db.query_cache
+
+    # Results cached before the last write can't be hit anymore
+    if cache and next(reversed(cache))[0] != version:
+        cache.clear()
+
+    try:
+        cache.move_to_end(key)
+        return cache[key][0]
+    except KeyError:
+        pass
+
+    results = tuple(compute())
+    size = sum(len(name) + len(text or "") for name, text in results)
+    if size > QUERY_CACHE_MAX_CHARS:
+        return results
+
+    cache[key] = (results, size)
+    cached_size = sum(size for _, size in cache.values())
+    while len(cache) > QUERY_CACHE_SIZE or cached_size > QUERY_CACHE_MAX_CHARS:
+        _, (_, evicted_size) = cache.popitem(last=False)
+        cached_size -= evicted_size
+    return results
 
-    results = []
-    for _, filename, ocr_text in all_records:
-        score = similarity_score(ocr_text, search_term)
-        if score > threshold:
-            results.append((score, filename, ocr_text))
 
-    # Sort by similarity score (descending)
-    results.sort(reverse=True, key=lambda x: x[0])
+def _rank_fuzzy(
+    db: OCRDatabase, search_term: str, threshold: float, limit: Optional[int]
+):
+    """Score records against `search_term` and return the best ones first."""
+    scored = _iter_scored(db, search_term, threshold)
+    if limit is None:
+        results = sorted(scored, key=itemgetter(0), reverse=True)
+    else:
+        results = heapq.nlargest(limit, scored, key=itemgetter(0))
+    return [record for _, record in results]
 
-    # Return without score
-    return [(filename, text) for _, filename, text in results]
 
+def _iter_scored(db: OCRDatabase, search_term: str, threshold: float):
+    """
+    Stream records from the database and score them a batch at a time.
 
-def similarity_score(text1: str, text2: str) -> float:
+    Args:
+        db: OCRDatabase instance
+        search_term: Text to search for
+        threshold: Approximate match threshold (0-1)
+
+    Yields:
+        (score, (filename, ocr_text)) for each record scoring above the threshold
+    """
+    # Match against the stored normalized text, normalizing the term once
+    search_term = normalize_text(search_term)
+
+    # Skip empty texts and those too short to contain the term at this
+    # threshold, before they are even read into Python
+    min_length = max(_min_text_length(len(search_term), threshold), 1)
+    candidates = db.iter_records(min_length=min_length)
+
+    score_cutoff = threshold * 100
+    for batch in _batched(candidates, SCORE_BATCH_SIZE):
+        # Scored in C++, texts below the cutoff score 0. cdist splits the work
+        # across CPU cores by row, so each text gets its own row.
+        scores = process.cdist(
+            [ocr_text_norm for _, _, ocr_text_norm in batch],
+            [search_term],
+            scorer=fuzz.partial_ratio,
+            score_cutoff=score_cutoff,
+            workers=-1,
+        )[:, 0]
+        for index in np.flatnonzero(scores >= score_cutoff):
+            filename, ocr_text, _ = batch[index]
+            yield float(scores[index]), (filename, ocr_text)
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _min_text_length(term_length: int, threshold: float) -> float:
     """
-    Calculate approximate similarity score between two strings (0-1).
-    This uses a simple ratio based on Levenshtein distance.
+    Get the length below which a text can't contain a term at a threshold.
+    Compared whole, such a text scores below the threshold, since
+    ratio <= 2 * len(text) / (len(text) + len(term)).
 
     Args:
-        text1: First text string
-        text2: Second text string
+        term_length: Length of the term searched for
+        threshold: Approximate match threshold (0-1)
 
     Returns:
-        Similarity ratio between 0 and 1
+        Minimum text length
     """
-    if not text1 or not text2:
-        return 0.0
-    ratio = Levenshtein.ratio(text1.lower(), text2.lower())
-    return ratio
+    return term_length * threshold / (2 - threshold)
 
 
 def print_result(filename: str, text: str):
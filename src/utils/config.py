@@ -2,6 +2,7 @@
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -55,8 +56,12 @@ def get_db_file() -> Path:
     return get_data_dir() / "pocr2.db"
 
 
+@lru_cache(maxsize=1)
 def load_config() -> dict:
-    """Load configuration from config.toml file."""
+    """
+    Load configuration from config.toml file.
+    The file is read once, call load_config.cache_clear() to read it again.
+    """
     config_file = get_config_file()
 
     if not config_file.exists():
@@ -1,10 +1,25 @@
+import hashlib
+import mmap
 import os
-from typing import List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+from typing import AbstractSet, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from enum import Enum
+
+# One OpenMP thread per tesseract, parallelism comes from the worker processes.
+# Set before tesserocr loads the OpenMP runtime, inherited by tesseract runs.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 from PIL import Image
 import pytesseract
 
+try:
+    from tesserocr import PSM, PyTessBaseAPI
+except ImportError:
+    # Optional, OCR runs through the tesseract executable without it
+    PyTessBaseAPI = None
+
 
 class ProcessingStatus(Enum):
     """Status of image processing operation."""
@@ -14,41 +29,157 @@ class ProcessingStatus(Enum):
     FAILED = "failed"
 
 
+# Size JPEG images are scaled down towards while decoding, if much larger
+OCR_DRAFT_SIZE = (2000, 2000)
+
+# Content hashes already in the database, set in each worker process
+_known_hashes: AbstractSet[str] = frozenset()
+
+# In-process tesseract engine of each worker process, when tesserocr is available
+_tess_api = None
+
+
+def _init_worker(tesseract_path: str, known_hashes: AbstractSet[str]):
+    """
+    Set up a worker process before it processes any image.
+
+    Args:
+        tesseract_path: Path to the tesseract executable
+        known_hashes: Content hashes of the images already in the database
+    """
+    global _known_hashes, _tess_api
+    pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    _known_hashes = known_hashes
+
+    # Load the OCR model once per worker instead of starting tesseract per image
+    if PyTessBaseAPI is not None:
+        try:
+            _tess_api = PyTessBaseAPI(psm=PSM.AUTO)
+        except RuntimeError as e:
+            print(f"tesserocr unavailable, falling back to tesseract: {e}")
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash the contents of a file, mapping it in memory rather than reading it.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    with open(path, "rb") as f:
+        # Empty files can't be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b(digest_size=16).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+
+
+def draft_image(image_path: str) -> Optional[Image.Image]:
+    """
+    Decode a large JPEG image in grayscale at a reduced scale, which its
+    decoder does for free. Only the header is read for other images.
+
+    Args:
+        image_path: Full path to the image file
+
+    Returns:
+        Reduced grayscale image, or None if the image can't be reduced
+    """
+    with Image.open(image_path) as image:
+        if image.format != "JPEG":
+            return None
+        full_size = image.size
+        image.draft("L", OCR_DRAFT_SIZE)
+        if image.size == full_size:
+            return None
+        return image.convert("L")
+
+
+def extract_text(image_path: str) -> str:
+    """
+    Extract text from a single image using OCR.
+
+    Args:
+        image_path: Full path to the image file
+
+    Returns:
+        Extracted text from the image
+    """
+    try:
+        image = draft_image(image_path)
+        # Otherwise tesseract reads the file itself, no need to decode it here
+        if _tess_api is not None:
+            if image is None:
+                _tess_api.SetImageFile(image_path)
+            else:
+                _tess_api.SetImage(image)
+            return _tess_api.GetUTF8Text()
+        text = pytesseract.image_to_string(image_path if image is None else image)
+        return text
+    except (IOError, OSError, RuntimeError) as e:
+        print(f"Error processing {image_path}: {e}")
+        return ""
+
+
+def ocr_image(image_path: str) -> Tuple[str, ProcessingStatus, Optional[str], str]:
+    """
+    Process a single image in a worker process: hash it and extract its text.
+    Images whose content is already in the database are not OCRed again.
+
+    Args:
+        image_path: Full path to the image
+
+    Returns:
+        Tuple of (filename, status, ocr_text, content_hash), where ocr_text
+        is None if the text is already stored under content_hash
+    """
+    filename = os.path.basename(image_path)
+
+    try:
+        content_hash = file_digest(image_path)
+    except OSError as e:
+        print(f"Error processing {image_path}: {e}")
+        return filename, ProcessingStatus.FAILED, "", ""
+
+    # Renamed or copied image, its text is already in the database
+    if content_hash in _known_hashes:
+        return filename, ProcessingStatus.SUCCESS, None, content_hash
+
+    ocr_text = extract_text(image_path)
+
+    if not ocr_text.strip():
+        return filename, ProcessingStatus.FAILED, "", content_hash
+
+    return filename, ProcessingStatus.SUCCESS, ocr_text, content_hash
+
+
 class OCRProcessor:
     """
-    Multithreaded OCR processor for image files.
+    Parallel OCR processor for image files.
+    OCR runs in worker processes, a single thread writes the results.
     """
 
-    def __init__(self, tesseract_path: str, max_workers: int = 4):
+    def __init__(
+        self, tesseract_path: str, max_workers: int = 4, batch_size: int = 500
+    ):
         """
         Initialize the OCR processor.
 
         Args:
             tesseract_path: Path to the tesseract executable
-            max_workers: Maximum number of threads for parallel processing
+            max_workers: Maximum number of worker processes for parallel processing
+            batch_size: Maximum number of OCR results written to the database
+                per transaction
         """
         self.tesseract_path = tesseract_path
         self.max_workers = max_workers
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        self.supported_extensions = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".gif")
-
-    def extract_text(self, image_path: str) -> str:
-        """
-        Extract text from a single image using OCR.
-
-        Args:
-            image_path: Full path to the image file
-
-        Returns:
-            Extracted text from the image
-        """
-        try:
-            image = Image.open(image_path)
-            text = pytesseract.image_to_string(image)
-            return text
-        except (IOError, OSError) as e:
-            print(f"Error processing {image_path}: {e}")
-            return ""
+        self.batch_size = batch_size
+        self.supported_extensions = frozenset(
+            (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".gif")
+        )
 
     def get_image_files(self, folder_path: str) -> List[str]:
         """
@@ -60,50 +191,45 @@ class OCRProcessor:
         Returns:
             List of full paths to image files
         """
-        image_files = []
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith(self.supported_extensions):
-                full_path = os.path.join(folder_path, filename)
-                image_files.append(full_path)
-        return image_files
-
-    def process_image(
-        self, image_path: str, db_handler, skip_existing: bool = True
-    ) -> Tuple[str, ProcessingStatus]:
+        # Directory entries carry their file type, no extra stat per file
+        with os.scandir(folder_path) as entries:
+            return [
+                entry.path
+                for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in self.supported_extensions
+                and entry.is_file()
+            ]
+
+    def _write_results(self, db_handler, results: queue.Queue):
         """
-        Process a single image: extract text and save to database.
+        Save OCR results from the queue in batches, until None is received.
+        Each batch holds whatever is queued, so results are not held back
+        waiting for a full batch when OCR is slower than writing.
 
         Args:
-            image_path: Full path to the image
             db_handler: Database handler instance
-            skip_existing: Whether to skip files already in the database
-
-        Returns:
-            Tuple of (filename, status)
+            results: Queue of (filename, ocr_text, content_hash) tuples
         """
-        filename = os.path.basename(image_path)
-
-        # Check if already processed
-        if skip_existing and db_handler.file_exists(filename):
-            return filename, ProcessingStatus.ALREADY_IN_DB
-
-        # Extract text
-        ocr_text = self.extract_text(image_path)
-
-        if not ocr_text.strip():
-            return filename, ProcessingStatus.FAILED
+        done = False
+        while not done:
+            pending = [results.get()]
+            while len(pending) < self.batch_size:
+                try:
+                    pending.append(results.get_nowait())
+                except queue.Empty:
+                    break
 
-        # Save to database
-        if db_handler.save_ocr_data(filename, ocr_text):
-            return filename, ProcessingStatus.SUCCESS
-        else:
-            return filename, ProcessingStatus.FAILED
+            if pending[-1] is None:
+                pending.pop()
+                done = True
+            if pending:
+                db_handler.save_ocr_batch(pending)
 
     def process_folder(
         self, folder_path: str, db_handler, progress_callback=None
     ) -> dict:
         """
-        Process all images in a folder using multithreading.
+        Process all images in a folder using a pool of worker processes.
 
         Args:
             folder_path: Path to folder containing images
@@ -121,27 +247,61 @@ class OCRProcessor:
 
         stats = {"total": total_files, "processed": 0, "skipped": 0, "failed": 0}
 
-        # Process images in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_file = {
-                executor.submit(self.process_image, img_path, db_handler): img_path
-                for img_path in image_files
-            }
-
-            # Process results as they complete
-            for future in as_completed(future_to_file):
-                filename, status = future.result()
-
-                if status == ProcessingStatus.SUCCESS:
-                    stats["processed"] += 1
-                elif status == ProcessingStatus.ALREADY_IN_DB:
-                    stats["skipped"] += 1
-                else:
-                    stats["failed"] += 1
-
-                # Call progress callback if provided
+        # Fetch known filenames once instead of querying once per file
+        existing_files = db_handler.get_all_filenames()
+
+        new_files = []
+        for img_path in image_files:
+            filename = os.path.basename(img_path)
+            if filename in existing_files:
+                stats["skipped"] += 1
                 if progress_callback:
-                    progress_callback(filename, status)
+                    progress_callback(filename, ProcessingStatus.ALREADY_IN_DB)
+            else:
+                new_files.append(img_path)
+
+        if not new_files:
+            return stats
+
+        results = queue.Queue()
+
+        # Only this process talks to the database, workers just run OCR
+        with ThreadPoolExecutor(max_workers=1) as writer_pool:
+            writer = writer_pool.submit(self._write_results, db_handler, results)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.tesseract_path, db_handler.get_all_hashes()),
+                ) as executor:
+                    futures = [
+                        executor.submit(ocr_image, img_path) for img_path in new_files
+                    ]
+
+                    # Process results as they complete
+                    for future in as_completed(futures):
+                        # The writer only stops early on an error: cancel the
+                        # remaining images and raise it
+                        if writer.done():
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            writer.result()
+
+                        filename, status, ocr_text, content_hash = future.result()
+
+                        if status == ProcessingStatus.SUCCESS:
+                            if ocr_text is None:
+                                ocr_text = db_handler.get_text_by_hash(content_hash)
+                            stats["processed"] += 1
+                            results.put((filename, ocr_text, content_hash))
+                        else:
+                            stats["failed"] += 1
+
+                        # Call progress callback if provided
+                        if progress_callback:
+                            progress_callback(filename, status)
+            finally:
+                results.put(None)
+            # Re-raise any error from the writer thread
+            writer.result()
 
         return stats